@@ -5,6 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from db.archive import DEFAULT_PARTITION, archive_table, completed_table
 from db.db_setup import Base
 from db.models import user, course
 
@@ -23,6 +24,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    """Skip the term partitions and archive table managed by db.archive."""
+    if type_ == "table":
+        return not (
+            name.startswith(f"{completed_table.name}_p")
+            or name in (DEFAULT_PARTITION, archive_table.name)
+        )
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -45,6 +56,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +80,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,119 @@
+"""partition completed_content_blocks by created_at
+
+Revision ID: 3b7c1e2a9d40
+Revises: f94b958596d0
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy_utils
+
+from db.archive import next_term, term_start
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1e2a9d40'
+down_revision: Union[str, None] = 'f94b958596d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # Without declarative partitioning, closed terms are moved into a
+        # plain archive table instead.
+        op.create_table('completed_content_blocks_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('content_block_id', sa.Integer(), nullable=False),
+        sa.Column('url', sqlalchemy_utils.types.url.URLType(), nullable=True),
+        sa.Column('feedback', sa.Text(), nullable=True),
+        sa.Column('grade', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_completed_content_blocks_student_id'), 'completed_content_blocks', ['student_id'], unique=False)
+        return
+
+    op.execute('ALTER TABLE completed_content_blocks RENAME TO completed_content_blocks_old')
+    op.execute('ALTER INDEX ix_completed_content_blocks_id RENAME TO ix_completed_content_blocks_old_id')
+    op.execute('ALTER TABLE completed_content_blocks_old RENAME CONSTRAINT completed_content_blocks_pkey TO completed_content_blocks_old_pkey')
+    # Free the foreign key names so the new table gets the default ones
+    op.execute('ALTER TABLE completed_content_blocks_old RENAME CONSTRAINT completed_content_blocks_student_id_fkey TO completed_content_blocks_old_student_id_fkey')
+    op.execute('ALTER TABLE completed_content_blocks_old RENAME CONSTRAINT completed_content_blocks_content_block_id_fkey TO completed_content_blocks_old_content_block_id_fkey')
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE completed_content_blocks (
+            id INTEGER NOT NULL DEFAULT nextval('completed_content_blocks_id_seq'),
+            student_id INTEGER NOT NULL REFERENCES users (id),
+            content_block_id INTEGER NOT NULL REFERENCES content_blocks (id),
+            url TEXT,
+            feedback TEXT,
+            grade INTEGER,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER SEQUENCE completed_content_blocks_id_seq OWNED BY completed_content_blocks.id')
+
+    oldest = bind.execute(
+        sa.text('SELECT MIN(created_at) FROM completed_content_blocks_old')
+    ).scalar()
+    # Term boundaries come from db.archive so the partitions created here
+    # line up with the ones `python -m db.archive partitions` adds later
+    now = datetime.utcnow()
+    start = term_start(oldest or now)
+    last = next_term(term_start(now))
+    while start <= last:
+        end = next_term(start)
+        op.execute(
+            f"CREATE TABLE completed_content_blocks_p{start:%Y%m%d} "
+            f"PARTITION OF completed_content_blocks "
+            f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+        start = end
+    op.execute('CREATE TABLE completed_content_blocks_default PARTITION OF completed_content_blocks DEFAULT')
+
+    op.execute('INSERT INTO completed_content_blocks SELECT id, student_id, content_block_id, url, feedback, grade, created_at, updated_at FROM completed_content_blocks_old')
+    op.execute('DROP TABLE completed_content_blocks_old')
+    op.create_index(op.f('ix_completed_content_blocks_id'), 'completed_content_blocks', ['id'], unique=False)
+    op.create_index(op.f('ix_completed_content_blocks_student_id'), 'completed_content_blocks', ['student_id'], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.drop_index(op.f('ix_completed_content_blocks_student_id'), table_name='completed_content_blocks')
+        op.drop_table('completed_content_blocks_archive')
+        return
+
+    op.drop_index(op.f('ix_completed_content_blocks_student_id'), table_name='completed_content_blocks')
+    op.drop_index(op.f('ix_completed_content_blocks_id'), table_name='completed_content_blocks')
+    op.execute('ALTER TABLE completed_content_blocks RENAME TO completed_content_blocks_partitioned')
+    op.execute('ALTER TABLE completed_content_blocks_partitioned RENAME CONSTRAINT completed_content_blocks_pkey TO completed_content_blocks_partitioned_pkey')
+    op.execute('ALTER TABLE completed_content_blocks_partitioned RENAME CONSTRAINT completed_content_blocks_student_id_fkey TO completed_content_blocks_partitioned_student_id_fkey')
+    op.execute('ALTER TABLE completed_content_blocks_partitioned RENAME CONSTRAINT completed_content_blocks_content_block_id_fkey TO completed_content_blocks_partitioned_content_block_id_fkey')
+    op.create_table('completed_content_blocks',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('completed_content_blocks_id_seq')"), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('content_block_id', sa.Integer(), nullable=False),
+    sa.Column('url', sqlalchemy_utils.types.url.URLType(), nullable=True),
+    sa.Column('feedback', sa.Text(), nullable=True),
+    sa.Column('grade', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['content_block_id'], ['content_blocks.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('INSERT INTO completed_content_blocks SELECT id, student_id, content_block_id, url, feedback, grade, created_at, updated_at FROM completed_content_blocks_partitioned')
+    op.execute('ALTER SEQUENCE completed_content_blocks_id_seq OWNED BY completed_content_blocks.id')
+    op.execute('DROP TABLE completed_content_blocks_partitioned')
+    op.create_index(op.f('ix_completed_content_blocks_id'), 'completed_content_blocks', ['id'], unique=False)
@@ -0,0 +1,53 @@
+"""course version column and cascading course deletes
+
+Revision ID: 8e2d5c4f1a67
+Revises: 3b7c1e2a9d40
+Create Date: 2026-10-19 14:03:55.118760
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2d5c4f1a67'
+down_revision: Union[str, None] = '3b7c1e2a9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table) for every foreign key below a course
+CASCADES = [
+    ('sections', 'course_id', 'courses'),
+    ('student_courses', 'course_id', 'courses'),
+    ('content_blocks', 'section_id', 'sections'),
+    ('completed_content_blocks', 'content_block_id', 'content_blocks'),
+]
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referred in CASCADES:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name, table, referred, [column], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('courses') as batch_op:
+        batch_op.add_column(
+            sa.Column('version', sa.Integer(), server_default='1', nullable=False)
+        )
+    # SQLite cannot alter constraints in place; tables created from the
+    # models there already carry ON DELETE CASCADE.
+    if op.get_bind().dialect.name == 'postgresql':
+        _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _replace_foreign_keys(None)
+    with op.batch_alter_table('courses') as batch_op:
+        batch_op.drop_column('version')
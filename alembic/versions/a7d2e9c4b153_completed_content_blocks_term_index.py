@@ -0,0 +1,28 @@
+"""index completed content blocks by block and term
+
+Revision ID: a7d2e9c4b153
+Revises: e5a0b3c9d812
+Create Date: 2026-10-19 21:05:42.318706
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e9c4b153'
+down_revision: Union[str, None] = 'e5a0b3c9d812'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # On PostgreSQL an index on the partitioned table is created on every
+    # term partition, including ones created later
+    op.create_index('ix_completed_content_blocks_block_term', 'completed_content_blocks', ['content_block_id', 'created_at', 'student_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_completed_content_blocks_block_term', table_name='completed_content_blocks')
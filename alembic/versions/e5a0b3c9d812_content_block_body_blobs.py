@@ -0,0 +1,94 @@
+"""move content block bodies to the blob store
+
+Revision ID: e5a0b3c9d812
+Revises: c41f9a7b2e85
+Create Date: 2026-10-19 19:21:07.664205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.blob_store import get_blob_store
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0b3c9d812'
+down_revision: Union[str, None] = 'c41f9a7b2e85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+content_blocks = sa.table('content_blocks',
+    sa.column('id', sa.Integer()),
+    sa.column('content', sa.Text()),
+    sa.column('content_hash', sa.String(length=64)),
+    sa.column('content_size', sa.Integer()),
+)
+
+# Bodies are moved in id-ordered batches so only one batch is in memory
+BATCH_SIZE = 500
+
+
+def _batches(bind, column):
+    """Yield (id, value) rows with a non-null `column` in id-ordered batches."""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(content_blocks.c.id, column)
+            .where(column.is_not(None))
+            .where(content_blocks.c.id > last_id)
+            .order_by(content_blocks.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('content_blocks') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('content_size', sa.Integer(), nullable=True))
+        batch_op.create_index(op.f('ix_content_blocks_content_hash'), ['content_hash'], unique=False)
+
+    bind = op.get_bind()
+    store = get_blob_store()
+    update = (
+        content_blocks.update()
+        .where(content_blocks.c.id == sa.bindparam('block_id'))
+        .values(content_hash=sa.bindparam('hash'), content_size=sa.bindparam('size'))
+    )
+    for rows in _batches(bind, content_blocks.c.content):
+        values = []
+        for block_id, content in rows:
+            data = content.encode('utf-8')
+            values.append({'block_id': block_id, 'hash': store.put(data), 'size': len(data)})
+        bind.execute(update, values)
+
+    with op.batch_alter_table('content_blocks') as batch_op:
+        batch_op.drop_column('content')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('content_blocks') as batch_op:
+        batch_op.add_column(sa.Column('content', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    store = get_blob_store()
+    update = (
+        content_blocks.update()
+        .where(content_blocks.c.id == sa.bindparam('block_id'))
+        .values(content=sa.bindparam('body'))
+    )
+    for rows in _batches(bind, content_blocks.c.content_hash):
+        bind.execute(update, [
+            {'block_id': block_id, 'body': store.get(digest).decode('utf-8')}
+            for block_id, digest in rows
+        ])
+
+    with op.batch_alter_table('content_blocks') as batch_op:
+        batch_op.drop_index(op.f('ix_content_blocks_content_hash'))
+        batch_op.drop_column('content_size')
+        batch_op.drop_column('content_hash')
@@ -1,16 +1,52 @@
 """Course API routes."""
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from api.utils.courses import create_course, get_course, get_courses
+from api.utils.analytics import get_course_analytics, refresh_course_analytics
+from api.utils.courses import (
+    create_course,
+    delete_course,
+    get_course,
+    get_courses,
+    update_course,
+)
+from api.utils.single_flight import in_own_session, single_flight
 from db.db_setup import get_db
-from pydantic_schemas.course import Course, CourseCreate
+from pydantic_schemas.course import (
+    Course,
+    CourseAnalytics,
+    CourseCreate,
+    CourseUpdate,
+)
 
 router = APIRouter()
 
+course_flight = single_flight("read_course")
+
+
+def parse_if_match(
+    if_match: Optional[str] = Header(None),
+) -> Optional[List[int]]:
+    """Parse an If-Match header into the course versions it accepts.
+
+    If-Match uses strong comparison, so weak tags never match. Fails with
+    412 right away when no listed tag can match any version.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdecimal():
+            versions.append(int(tag[1:-1]))
+    if not versions:
+        raise HTTPException(status_code=412, detail="Precondition Failed")
+    return versions
+
 
 @router.get("", response_model=List[Course])
 async def read_courses(
@@ -40,12 +76,15 @@ async def create_new_course(course: CourseCreate, db: Session = Depends(get_db))
 
 
 @router.get("/{course_id}", response_model=Course)
-async def read_course(course_id: int, db: Session = Depends(get_db)):
+async def read_course(course_id: int, response: Response):
     """Get a course by ID."""
     try:
-        course = get_course(db=db, course_id=course_id)
+        course = await course_flight.do(
+            course_id, in_own_session(get_course), course_id=course_id
+        )
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
+        response.headers["ETag"] = f'"{course.version}"'
         return course
     except HTTPException:
         raise
@@ -55,16 +94,73 @@ async def read_course(course_id: int, db: Session = Depends(get_db)):
         )
 
 
-@router.patch("/{course_id}")
-async def update_course(course_id: int):
-    """Update a course (not yet implemented)."""
-    return {"message": "Update endpoint not yet implemented"}
+@router.patch("/{course_id}", response_model=Course)
+async def update_existing_course(
+    course_id: int,
+    course: CourseUpdate,
+    response: Response,
+    versions: Optional[List[int]] = Depends(parse_if_match),
+    db: Session = Depends(get_db),
+):
+    """Update a course, honouring an optional If-Match version."""
+    try:
+        db_course = update_course(
+            db=db, course_id=course_id, course=course, versions=versions
+        )
+        if not db_course:
+            if not get_course(db=db, course_id=course_id):
+                raise HTTPException(status_code=404, detail="Course not found")
+            raise HTTPException(status_code=412, detail="Precondition Failed")
+        response.headers["ETag"] = f'"{db_course.version}"'
+        return db_course
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal Server Error: {str(e)}"
+        )
 
 
-@router.delete("/{course_id}")
-async def delete_course(course_id: int):
-    """Delete a course (not yet implemented)."""
-    return {"message": "Delete endpoint not yet implemented"}
+@router.delete("/{course_id}", status_code=204)
+async def delete_existing_course(
+    course_id: int,
+    versions: Optional[List[int]] = Depends(parse_if_match),
+    db: Session = Depends(get_db),
+):
+    """Delete a course and everything below it."""
+    try:
+        if not delete_course(db=db, course_id=course_id, versions=versions):
+            if not get_course(db=db, course_id=course_id):
+                raise HTTPException(status_code=404, detail="Course not found")
+            raise HTTPException(status_code=412, detail="Precondition Failed")
+        return Response(status_code=204)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal Server Error: {str(e)}"
+        )
+
+
+@router.get("/{course_id}/analytics", response_model=CourseAnalytics)
+async def read_course_analytics(course_id: int, db: Session = Depends(get_db)):
+    """Get the latest analytics snapshot for a course."""
+    try:
+        snapshot = get_course_analytics(db=db, course_id=course_id)
+        if not snapshot:
+            if not get_course(db=db, course_id=course_id):
+                raise HTTPException(status_code=404, detail="Course not found")
+            # Building takes seconds for large courses; keep the loop free
+            snapshot = await run_in_threadpool(
+                refresh_course_analytics, db=db, course_id=course_id
+            )
+        return snapshot
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal Server Error: {str(e)}"
+        )
 
 
 @router.get("/{course_id}/sections")
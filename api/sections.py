@@ -1,8 +1,53 @@
 """Section and ContentBlock API routes."""
 
-from fastapi import APIRouter
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from api.utils.sections import get_content_block_body_ref, set_content_block_body
+from db.blob_store import get_blob_store
+from db.db_setup import get_db
 
 router = APIRouter()
+content_blocks_router = APIRouter()
+
+# Starlette appends the charset to text media types itself
+BODY_MEDIA_TYPE = "text/html"
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into inclusive offsets.
+
+    Returns None for a range that must be ignored (another unit, several
+    ranges or a malformed value), in which case the full body is sent.
+    Raises a 416 HTTPException when the range lies past the end of the body.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                return None
+        else:
+            suffix = int(last)
+            if suffix < 0:
+                return None
+            # An empty suffix selects nothing, leaving start at `size`
+            start, end = size - min(suffix, size), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=416, headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
 
 
 @router.get("/{section_id}")
@@ -17,7 +62,92 @@ async def read_section_content_blocks(section_id: int):
     return {"message": "Content blocks endpoint not yet implemented"}
 
 
-@router.get("/content-blocks/{block_id}")
+@content_blocks_router.get("/{block_id}")
 async def read_content_block(block_id: int):
     """Get a content block by ID (not yet implemented)."""
     return {"message": "Content block endpoint not yet implemented"}
+
+
+@content_blocks_router.get("/{block_id}/body")
+async def read_content_block_body(
+    block_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """Stream a content block body from the blob store with Range support."""
+    try:
+        ref = get_content_block_body_ref(db=db, block_id=block_id)
+        if not ref:
+            raise HTTPException(status_code=404, detail="Content block not found")
+        if not ref.content_hash:
+            raise HTTPException(status_code=404, detail="Content block has no body")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal Server Error: {str(e)}"
+        )
+
+    etag = f'"{ref.content_hash}"'
+    headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    # Fail before any header is sent rather than truncate the body mid-stream
+    store = get_blob_store()
+    if not await run_in_threadpool(store.exists, ref.content_hash):
+        raise HTTPException(
+            status_code=500, detail="Content block body is missing from storage"
+        )
+
+    size = ref.content_size
+    start, end = 0, size - 1
+    status_code = 200
+    byte_range = None
+    # Ranges that cannot be parsed are ignored and the full body is sent
+    if range_header and size > 0:
+        try:
+            byte_range = parse_range(range_header, size)
+        except HTTPException as e:
+            return Response(status_code=416, headers={**headers, **e.headers})
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    if size == 0:
+        return Response(headers=headers, media_type=BODY_MEDIA_TYPE)
+    return StreamingResponse(
+        store.read_range(ref.content_hash, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type=BODY_MEDIA_TYPE,
+    )
+
+
+@content_blocks_router.put("/{block_id}/body", status_code=204)
+async def replace_content_block_body(
+    block_id: int, request: Request, db: Session = Depends(get_db)
+):
+    """Replace a content block body with the UTF-8 HTML request body."""
+    body = await request.body()
+    try:
+        body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 encoded")
+    try:
+        # Writing the blob is blocking I/O, so keep it off the event loop
+        digest = await run_in_threadpool(
+            set_content_block_body, db=db, block_id=block_id, body=body
+        )
+        if not digest:
+            raise HTTPException(status_code=404, detail="Content block not found")
+        return Response(status_code=204, headers={"ETag": f'"{digest}"'})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal Server Error: {str(e)}"
+        )
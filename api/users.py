@@ -3,22 +3,25 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from api.utils.courses import get_user_courses
+from api.utils.single_flight import in_own_session, single_flight
 from api.utils.users import (
     create_user,
     get_user,
     get_user_by_email,
     get_users,
 )
-from db.db_setup import async_get_db, get_db
+from db.db_setup import get_db
 from pydantic_schemas.course import Course
 from pydantic_schemas.user import User, UserCreate
 
 router = APIRouter()
 
+user_flight = single_flight("read_user")
+user_courses_flight = single_flight("read_user_courses")
+
 
 @router.get("", response_model=List[User])
 async def read_users(
@@ -53,10 +56,12 @@ async def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{user_id}", response_model=User)
-async def read_user(user_id: int, db: AsyncSession = Depends(async_get_db)):
+async def read_user(user_id: int):
     """Get a user by ID."""
     try:
-        db_user = await get_user(db=db, user_id=user_id)
+        db_user = await user_flight.do(
+            user_id, in_own_session(get_user), user_id=user_id
+        )
         if not db_user:
             raise HTTPException(status_code=404, detail="User not found")
         return db_user
@@ -69,10 +74,12 @@ async def read_user(user_id: int, db: AsyncSession = Depends(async_get_db)):
 
 
 @router.get("/{user_id}/courses", response_model=List[Course])
-async def read_user_courses(user_id: int, db: Session = Depends(get_db)):
+async def read_user_courses(user_id: int):
     """Get all courses created by a user."""
     try:
-        courses = get_user_courses(db=db, user_id=user_id)
+        courses = await user_courses_flight.do(
+            user_id, in_own_session(get_user_courses), user_id=user_id
+        )
         return courses
     except Exception as e:
         raise HTTPException(
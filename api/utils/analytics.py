@@ -0,0 +1,224 @@
+"""Course analytics snapshot functions.
+
+Analytics are aggregated in the database with GROUP BY queries over the
+current term and stored as one compact JSON row per course, so reading
+them never touches the completion history.
+
+Stale snapshots are refreshed by one scheduled process per deployment:
+    python -m api.utils.analytics [--loop]
+"""
+
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, distinct, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from db.archive import current_term_start
+from db.db_setup import SessionLocal
+from db.models.course import (
+    CompletedContentBlock,
+    ContentBlock,
+    Course,
+    CourseAnalytics,
+    Section,
+    StudentCourse,
+)
+
+# Maximum snapshot age in seconds, and the interval of `--loop`
+ANALYTICS_REFRESH_SECONDS = int(os.getenv("ANALYTICS_REFRESH_SECONDS", "900"))
+PERCENTILES = (25, 50, 75, 90)
+
+logger = logging.getLogger(__name__)
+
+
+def _percentiles(distribution: List[Dict[str, int]]) -> Dict[str, int]:
+    """Nearest-rank percentiles from a sorted grade histogram."""
+    total = sum(bucket["count"] for bucket in distribution)
+    if total == 0:
+        return {}
+    result = {}
+    for p in PERCENTILES:
+        rank = max(1, -(-p * total // 100))
+        seen = 0
+        for bucket in distribution:
+            seen += bucket["count"]
+            if seen >= rank:
+                result[f"p{p}"] = bucket["grade"]
+                break
+    return result
+
+
+def build_course_analytics(db: Session, course_id: int) -> Dict:
+    """Aggregate grade, section and content block statistics for a course."""
+    since = current_term_start()
+    completed = and_(
+        CompletedContentBlock.content_block_id == ContentBlock.id,
+        CompletedContentBlock.created_at >= since,
+    )
+
+    # Enrollments share the completions' term, so drop-off from the first
+    # block compares students of the same term
+    enrolled, finished = db.execute(
+        select(
+            func.count(StudentCourse.id),
+            func.coalesce(
+                func.sum(case((StudentCourse.completed.is_(True), 1), else_=0)),
+                0,
+            ),
+        )
+        .where(StudentCourse.course_id == course_id)
+        .where(StudentCourse.created_at >= since)
+    ).one()
+
+    grades = db.execute(
+        select(CompletedContentBlock.grade, func.count())
+        .join(ContentBlock, completed)
+        .join(Section, ContentBlock.section_id == Section.id)
+        .where(Section.course_id == course_id)
+        .where(CompletedContentBlock.grade.is_not(None))
+        .group_by(CompletedContentBlock.grade)
+        .order_by(CompletedContentBlock.grade)
+    ).all()
+    distribution = [{"grade": grade, "count": count} for grade, count in grades]
+
+    sections = db.execute(
+        select(Section.id, func.count(distinct(CompletedContentBlock.student_id)))
+        .outerjoin(ContentBlock, ContentBlock.section_id == Section.id)
+        .outerjoin(CompletedContentBlock, completed)
+        .where(Section.course_id == course_id)
+        .group_by(Section.id)
+        .order_by(Section.id)
+    ).all()
+
+    blocks = db.execute(
+        select(
+            ContentBlock.id,
+            ContentBlock.section_id,
+            func.count(distinct(CompletedContentBlock.student_id)),
+        )
+        .join(Section, ContentBlock.section_id == Section.id)
+        .outerjoin(CompletedContentBlock, completed)
+        .where(Section.course_id == course_id)
+        .group_by(ContentBlock.id, ContentBlock.section_id)
+        .order_by(ContentBlock.section_id, ContentBlock.id)
+    ).all()
+    content_blocks = []
+    previous = enrolled
+    for block_id, section_id, students in blocks:
+        content_blocks.append(
+            {
+                "content_block_id": block_id,
+                "section_id": section_id,
+                "students": students,
+                "drop_off": max(previous - students, 0),
+            }
+        )
+        previous = students
+
+    return {
+        "enrolled": enrolled,
+        "completed": finished,
+        "grade_distribution": distribution,
+        "grade_percentiles": _percentiles(distribution),
+        "sections": [
+            {"section_id": section_id, "students": students}
+            for section_id, students in sections
+        ],
+        "content_blocks": content_blocks,
+    }
+
+
+def refresh_course_analytics(db: Session, course_id: int):
+    """Rebuild and upsert the analytics snapshot for a course.
+
+    The upsert lets concurrent builders for the same course both succeed.
+    """
+    dialect_insert = (
+        postgresql.insert
+        if db.get_bind().dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    query = dialect_insert(CourseAnalytics).values(
+        course_id=course_id,
+        data=build_course_analytics(db, course_id),
+        computed_at=datetime.utcnow(),
+    )
+    query = query.on_conflict_do_update(
+        index_elements=[CourseAnalytics.course_id],
+        set_={
+            "data": query.excluded.data,
+            "computed_at": query.excluded.computed_at,
+        },
+    ).returning(CourseAnalytics)
+    snapshot = db.scalars(
+        query, execution_options={"populate_existing": True}
+    ).one()
+    # Keep the returned row loaded instead of expiring it on commit
+    db.expunge(snapshot)
+    db.commit()
+    return snapshot
+
+
+def get_course_analytics(db: Session, course_id: int):
+    """Get the stored analytics snapshot for a course."""
+    return db.get(CourseAnalytics, course_id)
+
+
+def refresh_stale_course_analytics(db: Session, max_age: int) -> int:
+    """Refresh snapshots older than `max_age` seconds or missing entirely.
+
+    A failing course is logged and skipped. Returns how many were refreshed.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+    course_ids = db.scalars(
+        select(Course.id)
+        .outerjoin(CourseAnalytics, CourseAnalytics.course_id == Course.id)
+        .where(
+            (CourseAnalytics.computed_at.is_(None))
+            | (CourseAnalytics.computed_at < cutoff)
+        )
+    ).all()
+    refreshed = 0
+    for course_id in course_ids:
+        try:
+            refresh_course_analytics(db, course_id)
+            refreshed += 1
+        except Exception:
+            db.rollback()
+            logger.exception("Refreshing analytics for course %s failed", course_id)
+    return refreshed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m api.utils.analytics")
+    parser.add_argument(
+        "--loop",
+        action="store_true",
+        help=f"Keep refreshing every ANALYTICS_REFRESH_SECONDS "
+        f"({ANALYTICS_REFRESH_SECONDS})",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        db = SessionLocal()
+        try:
+            refreshed = refresh_stale_course_analytics(
+                db, ANALYTICS_REFRESH_SECONDS
+            )
+        finally:
+            db.close()
+        logger.info("Refreshed %s course analytics snapshots", refreshed)
+        if not args.loop:
+            break
+        time.sleep(ANALYTICS_REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
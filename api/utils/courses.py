@@ -1,9 +1,13 @@
 """Course utility functions for database operations."""
 
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
 
 from db.models.course import Course
-from pydantic_schemas.course import CourseCreate
+from pydantic_schemas.course import CourseCreate, CourseUpdate
 
 
 def get_courses(db: Session, skip: int = 0, limit: int = 100):
@@ -32,3 +36,55 @@ def create_course(db: Session, course: CourseCreate):
 def get_user_courses(db: Session, user_id: int):
     """Get all courses created by a specific user."""
     return db.query(Course).filter(Course.user_id == user_id).all()
+
+
+def update_course(
+    db: Session,
+    course_id: int,
+    course: CourseUpdate,
+    versions: Optional[List[int]] = None,
+):
+    """Update a course in a single UPDATE ... RETURNING statement.
+
+    When `versions` is given the update only applies if the current version
+    is one of them, so None means the course is either missing or was
+    changed meanwhile.
+    """
+    query = (
+        update(Course)
+        .where(Course.id == course_id)
+        .values(
+            **course.model_dump(exclude_unset=True),
+            version=Course.version + 1,
+            updated_at=datetime.utcnow(),
+        )
+        .returning(Course)
+    )
+    if versions is not None:
+        query = query.where(Course.version.in_(versions))
+    db_course = db.scalars(query).one_or_none()
+    if db_course is not None:
+        # Keep the returned row loaded instead of expiring it on commit
+        db.expunge(db_course)
+    db.commit()
+    return db_course
+
+
+def delete_course(
+    db: Session, course_id: int, versions: Optional[List[int]] = None
+):
+    """Delete a course, relying on ON DELETE CASCADE for its children.
+
+    Returns False when nothing was deleted.
+    """
+    query = (
+        delete(Course)
+        .where(Course.id == course_id)
+        .returning(Course.id)
+        .execution_options(synchronize_session=False)
+    )
+    if versions is not None:
+        query = query.where(Course.version.in_(versions))
+    deleted = db.execute(query).first() is not None
+    db.commit()
+    return deleted
@@ -0,0 +1,44 @@
+"""Section and content block utility functions for database operations."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from db.blob_store import get_blob_store
+from db.models.course import ContentBlock
+
+
+def get_content_block_body_ref(db: Session, block_id: int):
+    """Get the blob hash and size of a content block body.
+
+    Only the reference columns are selected, never the block row itself.
+    """
+    query = select(ContentBlock.content_hash, ContentBlock.content_size).where(
+        ContentBlock.id == block_id
+    )
+    return db.execute(query).first()
+
+
+def set_content_block_body(
+    db: Session, block_id: int, body: bytes
+) -> Optional[str]:
+    """Store a content block body in the blob store and reference it.
+
+    Identical bodies share one blob. Returns the hash, or None when the
+    content block does not exist.
+    """
+    digest = get_blob_store().put(body)
+    result = db.execute(
+        update(ContentBlock)
+        .where(ContentBlock.id == block_id)
+        .values(
+            content_hash=digest,
+            content_size=len(body),
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return digest if result.rowcount else None
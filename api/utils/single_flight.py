@@ -0,0 +1,120 @@
+"""Single-flight coalescing for identical concurrent read requests."""
+
+import asyncio
+import inspect
+import os
+from typing import Any, Callable, Dict, Hashable
+
+from fastapi.concurrency import run_in_threadpool
+
+from db.db_setup import AsyncSessionLocal, SessionLocal
+
+# Comma-separated list of route names that coalesce identical reads
+SINGLE_FLIGHT_ROUTES = os.getenv(
+    "SINGLE_FLIGHT_ROUTES",
+    "read_course,read_user,read_user_courses",
+)
+
+_enabled_routes = {
+    name.strip() for name in SINGLE_FLIGHT_ROUTES.split(",") if name.strip()
+}
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """Share one in-flight call and its result between identical requests.
+
+    Calls are keyed by the caller; while a call for a key is running, any
+    other caller with the same key awaits the same result instead of
+    issuing its own query. Sync helpers are run in the threadpool so the
+    event loop stays free to accept the followers.
+    """
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` once per key for concurrent callers."""
+        self.calls += 1
+        if not self.enabled:
+            self.executions += 1
+            return await _call(fn, *args, **kwargs)
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        # The call runs detached from the leader's request, so cancelling
+        # the leader (e.g. a client disconnect) does not fail the followers
+        task = asyncio.create_task(_call(fn, *args, **kwargs))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        self.executions += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call so the next request for its key runs anew."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark as retrieved so a failure without waiters is not logged
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters for this group."""
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+async def _call(fn: Callable, *args, **kwargs) -> Any:
+    """Await a coroutine function or run a sync function in the threadpool."""
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args, **kwargs)
+    return await run_in_threadpool(fn, *args, **kwargs)
+
+
+def in_own_session(fn: Callable) -> Callable:
+    """Wrap a read helper to run in a session of its own.
+
+    A coalesced call can outlive the request that started it, so it must
+    not use that request's session.
+    """
+    if inspect.iscoroutinefunction(fn):
+
+        async def run_async(*args, **kwargs):
+            async with AsyncSessionLocal() as db:
+                return await fn(*args, db=db, **kwargs)
+
+        return run_async
+
+    def run(*args, **kwargs):
+        db = SessionLocal()
+        try:
+            return fn(*args, db=db, **kwargs)
+        finally:
+            db.close()
+
+    return run
+
+
+def single_flight(route: str) -> SingleFlight:
+    """Get the single-flight group for a route, creating it on first use."""
+    if route not in _groups:
+        _groups[route] = SingleFlight(route, enabled=route in _enabled_routes)
+    return _groups[route]
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Return counters for every single-flight group."""
+    return {name: group.stats() for name, group in _groups.items()}
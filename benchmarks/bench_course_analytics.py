@@ -0,0 +1,91 @@
+"""Benchmark course analytics for one large course.
+
+Seeds a single course with `--students` enrolled students into a fresh
+in-memory SQLite database, then times building the snapshot and reading
+it back through the API.
+
+Usage:
+    python -m benchmarks.bench_course_analytics [--students N] [--runs N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+# Configure the engines before any application module is imported
+os.environ.setdefault(
+    "DATABASE_URL", "sqlite:///file:lms_bench?mode=memory&cache=shared&uri=true"
+)
+os.environ.setdefault("BLOB_STORE_DIR", tempfile.mkdtemp(prefix="lms-blobs-"))
+
+from fastapi.testclient import TestClient
+
+from api.utils.analytics import build_course_analytics, refresh_course_analytics
+from db.db_setup import Base, SessionLocal, engine
+from db.seed import SeedConfig, seed
+from main import app
+
+
+def _timed(label: str, fn, runs: int) -> None:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(
+        f"{label}: best {timings[0] * 1000:.1f} ms, "
+        f"median {timings[len(timings) // 2] * 1000:.1f} ms"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_course_analytics"
+    )
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--sections", type=int, default=5)
+    parser.add_argument("--blocks", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    counts = seed(
+        config=SeedConfig(
+            teachers=1,
+            students=args.students,
+            courses=1,
+            sections_per_course=args.sections,
+            blocks_per_section=args.blocks,
+            students_per_course=args.students,
+            lesson_bodies=0,
+        )
+    )
+    print(
+        f"seeded {counts['student_courses']} enrollments and "
+        f"{counts['completed_content_blocks']} completions "
+        f"in {time.perf_counter() - started:.1f} s"
+    )
+
+    db = SessionLocal()
+    try:
+        _timed("build", lambda: build_course_analytics(db, 1), args.runs)
+        _timed("refresh", lambda: refresh_course_analytics(db, 1), args.runs)
+    finally:
+        db.close()
+
+    with TestClient(app) as client:
+
+        def read():
+            response = client.get("/api/courses/1/analytics")
+            response.raise_for_status()
+
+        _timed("read", read, args.runs * 20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Term partitions and archival for completed content block history.
+
+On PostgreSQL `completed_content_blocks` is range-partitioned by
+`created_at`, one partition per term. Closed terms are exported to
+gzip-compressed NDJSON files and their partitions dropped. Other
+databases have no partitions, so closed-term rows are moved into the
+`completed_content_blocks_archive` table instead.
+
+Usage:
+    python -m db.archive partitions [--ahead N]
+    python -m db.archive archive [--before YYYY-MM-DD] [--out DIR]
+"""
+
+import argparse
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import Column, MetaData, Table, delete, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from db.db_setup import engine
+from db.models.course import CompletedContentBlock
+
+# Length of a term in months; partitions and archives are cut per term.
+# Terms must tile the year so every term starts where the previous ended.
+TERM_MONTHS = int(os.getenv("TERM_MONTHS", "6"))
+if TERM_MONTHS not in (1, 2, 3, 4, 6, 12):
+    raise ValueError(
+        f"TERM_MONTHS must divide 12 (1, 2, 3, 4, 6 or 12), got {TERM_MONTHS}"
+    )
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+
+completed_table = CompletedContentBlock.__table__
+DEFAULT_PARTITION = f"{completed_table.name}_default"
+archive_table = Table(
+    "completed_content_blocks_archive",
+    MetaData(),
+    *[
+        Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+        for c in completed_table.columns
+    ],
+)
+
+
+def term_start(value: datetime) -> datetime:
+    """Get the start of the term containing `value`."""
+    month = (value.month - 1) // TERM_MONTHS * TERM_MONTHS + 1
+    return datetime(value.year, month, 1)
+
+
+def next_term(start: datetime) -> datetime:
+    """Get the start of the term following the one starting at `start`."""
+    month = start.month - 1 + TERM_MONTHS
+    return datetime(start.year + month // 12, month % 12 + 1, 1)
+
+
+def current_term_start() -> datetime:
+    """Get the start of the current term.
+
+    Filtering on `created_at >= current_term_start()` lets PostgreSQL prune
+    every closed-term partition from gradebook and progress queries.
+    """
+    return term_start(datetime.utcnow())
+
+
+def partition_name(start: datetime) -> str:
+    """Get the partition table name for the term starting at `start`."""
+    return f"{completed_table.name}_p{start:%Y%m%d}"
+
+
+def _is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    query = text(
+        "SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :name"
+    )
+    return conn.execute(query, {"name": completed_table.name}).first() is not None
+
+
+def _partition_exists(conn: Connection, name: str) -> bool:
+    query = text("SELECT to_regclass(:name) IS NOT NULL")
+    return bool(conn.execute(query, {"name": name}).scalar())
+
+
+def _create_partition(conn: Connection, start: datetime) -> str:
+    """Create the partition for a term, moving its rows out of the default.
+
+    PostgreSQL refuses to add a range partition while the default partition
+    holds rows in that range. So the default is detached while its rows are
+    moved to the new partition, and then it is attached again.
+    """
+    end = next_term(start)
+    name = partition_name(start)
+    columns = ", ".join(c.name for c in completed_table.columns)
+    bounds = {"start": start, "end": end}
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF {completed_table.name} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    )
+    stranded = _partition_exists(conn, DEFAULT_PARTITION) and conn.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :start AND created_at < :end)"
+        ),
+        bounds,
+    ).scalar()
+    if not stranded:
+        conn.execute(create)
+        return name
+
+    conn.execute(
+        text(
+            f"ALTER TABLE {completed_table.name} "
+            f"DETACH PARTITION {DEFAULT_PARTITION}"
+        )
+    )
+    conn.execute(create)
+    in_range = "WHERE created_at >= :start AND created_at < :end"
+    conn.execute(
+        text(
+            f"INSERT INTO {name} ({columns}) "
+            f"SELECT {columns} FROM {DEFAULT_PARTITION} {in_range}"
+        ),
+        bounds,
+    )
+    conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} {in_range}"), bounds)
+    conn.execute(
+        text(
+            f"ALTER TABLE {completed_table.name} "
+            f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+        )
+    )
+    return name
+
+
+def ensure_partitions(bind: Engine = engine, ahead: int = 1) -> List[str]:
+    """Create partitions for the current term and `ahead` terms after it.
+
+    Run this on a schedule, at least once per term. Rows for terms that
+    had no partition yet end up in the default partition; they are moved
+    into their own partition here, including for terms already past.
+    """
+    created = []
+    with bind.begin() as conn:
+        if not _is_partitioned(conn):
+            return created
+        start = current_term_start()
+        if _partition_exists(conn, DEFAULT_PARTITION):
+            oldest = conn.execute(
+                text(f"SELECT MIN(created_at) FROM {DEFAULT_PARTITION}")
+            ).scalar()
+            if oldest is not None:
+                start = min(start, term_start(oldest))
+        last = current_term_start()
+        for _ in range(ahead):
+            last = next_term(last)
+        while start <= last:
+            if not _partition_exists(conn, partition_name(start)):
+                created.append(_create_partition(conn, start))
+            start = next_term(start)
+    return created
+
+
+def _closed_terms(
+    conn: Connection, before: datetime
+) -> Iterator[Tuple[datetime, datetime]]:
+    oldest = conn.execute(select(func.min(completed_table.c.created_at))).scalar()
+    if oldest is None:
+        return
+    start = term_start(oldest)
+    while next_term(start) <= before:
+        yield start, next_term(start)
+        start = next_term(start)
+
+
+def _export_term(
+    conn: Connection, start: datetime, end: datetime, path: str
+) -> int:
+    query = (
+        select(completed_table)
+        .where(completed_table.c.created_at >= start)
+        .where(completed_table.c.created_at < end)
+        .order_by(completed_table.c.id)
+    )
+    count = 0
+    # Per statement: Connection.execution_options would also make the
+    # DETACH and DROP that follow run through a server-side cursor
+    result = conn.execute(
+        query, execution_options={"stream_results": True, "yield_per": 1000}
+    )
+    with gzip.open(path, "xt", encoding="utf-8") as f:
+        for row in result.mappings():
+            f.write(json.dumps(dict(row), default=str) + "\n")
+            count += 1
+    return count
+
+
+def archive_closed_terms(
+    bind: Engine = engine,
+    before: Optional[datetime] = None,
+    out_dir: str = ARCHIVE_DIR,
+) -> List[Tuple[str, int]]:
+    """Move every term that ended before `before` out of the live table.
+
+    `before` defaults to the start of the current term. Returns the written
+    archive files with their row counts.
+
+    Files are written under a `.partial` name and only renamed once the
+    rows are gone from the live table, so a failed run leaves no archive
+    behind and the next run exports its rows exactly once.
+    """
+    before = term_start(before or datetime.utcnow())
+    run = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}"
+    os.makedirs(out_dir, exist_ok=True)
+    exported = []
+    try:
+        with bind.begin() as conn:
+            partitioned = _is_partitioned(conn)
+            if not partitioned:
+                archive_table.create(conn, checkfirst=True)
+            for start, end in list(_closed_terms(conn, before)):
+                # Each run writes its own file, so rows that arrive late for
+                # an archived term are exported next to the earlier archive
+                path = os.path.join(
+                    out_dir, f"{partition_name(start)}.{run}.ndjson.gz"
+                )
+                count = _export_term(conn, start, end, f"{path}.partial")
+                exported.append((path, count))
+
+                name = partition_name(start)
+                if partitioned and _partition_exists(conn, name):
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {completed_table.name} "
+                            f"DETACH PARTITION {name}"
+                        )
+                    )
+                    conn.execute(text(f"DROP TABLE {name}"))
+                    continue
+
+                in_term = (completed_table.c.created_at >= start) & (
+                    completed_table.c.created_at < end
+                )
+                if not partitioned:
+                    conn.execute(
+                        insert(archive_table).from_select(
+                            [c.name for c in completed_table.columns],
+                            select(completed_table).where(in_term),
+                        )
+                    )
+                conn.execute(delete(completed_table).where(in_term))
+    except BaseException:
+        for name in os.listdir(out_dir):
+            if name.endswith(f".{run}.ndjson.gz.partial"):
+                os.remove(os.path.join(out_dir, name))
+        raise
+
+    archived = []
+    for path, count in exported:
+        if count == 0:
+            os.remove(f"{path}.partial")
+            continue
+        # Linking refuses to replace an existing archive file
+        os.link(f"{path}.partial", path)
+        os.remove(f"{path}.partial")
+        archived.append((path, count))
+    return archived
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m db.archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    partitions = commands.add_parser(
+        "partitions", help="Create partitions for upcoming terms"
+    )
+    partitions.add_argument("--ahead", type=int, default=1)
+
+    archive = commands.add_parser("archive", help="Archive closed terms")
+    archive.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Archive terms that ended before this date",
+    )
+    archive.add_argument("--out", default=ARCHIVE_DIR)
+
+    args = parser.parse_args(argv)
+    if args.command == "partitions":
+        for name in ensure_partitions(ahead=args.ahead):
+            print(f"created {name}")
+    else:
+        for path, count in archive_closed_terms(
+            before=args.before, out_dir=args.out
+        ):
+            print(f"archived {count} rows to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Content-addressed blob storage for content block bodies.
+
+Bodies are stored under their SHA-256 hex digest, so identical bodies are
+written once and the digest doubles as a strong ETag. The filesystem
+backend is the default; the S3 backend works against AWS or any
+S3-protocol stand-in such as MinIO via `BLOB_STORE_ENDPOINT_URL`.
+"""
+
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterator, Optional
+
+BLOB_STORE = os.getenv("BLOB_STORE", "filesystem")
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "blobs")
+BLOB_STORE_BUCKET = os.getenv("BLOB_STORE_BUCKET", "lms-blobs")
+BLOB_STORE_ENDPOINT_URL = os.getenv("BLOB_STORE_ENDPOINT_URL")
+
+CHUNK_SIZE = 64 * 1024
+
+
+def blob_hash(data: bytes) -> str:
+    """Get the content address of some data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Interface shared by blob store backends."""
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """Store data unless already present and return its hash."""
+
+    def get(self, digest: str) -> bytes:
+        """Read a whole blob."""
+        size = self.size(digest)
+        if size == 0:
+            return b""
+        return b"".join(self.read_range(digest, 0, size - 1))
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        """Check whether a blob is stored."""
+
+    @abstractmethod
+    def size(self, digest: str) -> int:
+        """Get the size of a blob in bytes."""
+
+    @abstractmethod
+    def read_range(self, digest: str, start: int, end: int) -> Iterator[bytes]:
+        """Yield the bytes from `start` to `end` inclusive in chunks."""
+
+
+class FileSystemBlobStore(BlobStore):
+    """Blob store keeping one file per blob under a local directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def put(self, data: bytes) -> str:
+        digest = blob_hash(data)
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see partial blobs
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return digest
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self._path(digest))
+
+    def read_range(self, digest: str, start: int, end: int) -> Iterator[bytes]:
+        with open(self._path(digest), "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+class S3BlobStore(BlobStore):
+    """Blob store backed by an S3-protocol bucket."""
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise RuntimeError(
+                "The S3 blob store requires boto3 to be installed"
+            )
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self._client_error = ClientError
+
+    def _head(self, digest: str) -> Optional[dict]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=digest)
+        except self._client_error as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def put(self, data: bytes) -> str:
+        digest = blob_hash(data)
+        if self._head(digest) is None:
+            self.client.put_object(Bucket=self.bucket, Key=digest, Body=data)
+        return digest
+
+    def exists(self, digest: str) -> bool:
+        return self._head(digest) is not None
+
+    def size(self, digest: str) -> int:
+        return self._head(digest)["ContentLength"]
+
+    def read_range(self, digest: str, start: int, end: int) -> Iterator[bytes]:
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=digest, Range=f"bytes={start}-{end}"
+        )
+        yield from response["Body"].iter_chunks(CHUNK_SIZE)
+
+
+@lru_cache
+def get_blob_store() -> BlobStore:
+    """Get the configured blob store."""
+    if BLOB_STORE == "s3":
+        return S3BlobStore(BLOB_STORE_BUCKET, BLOB_STORE_ENDPOINT_URL)
+    return FileSystemBlobStore(BLOB_STORE_DIR)
@@ -1,7 +1,18 @@
 """Course, Section, ContentBlock and related models."""
 
 import enum
-from sqlalchemy import Enum, Column, ForeignKey, Integer, String, Text, Boolean
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import URLType
 
@@ -27,10 +38,15 @@ class Course(Timestamp, Base):
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     created_by = relationship(User)
-    sections = relationship("Section", back_populates="course", uselist=False)
-    student_courses = relationship("StudentCourse", back_populates="course")
+    sections = relationship(
+        "Section", back_populates="course", uselist=False, passive_deletes=True
+    )
+    student_courses = relationship(
+        "StudentCourse", back_populates="course", passive_deletes=True
+    )
 
 
 class Section(Timestamp, Base):
@@ -41,10 +57,14 @@ class Section(Timestamp, Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(
+        Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False
+    )
 
     course = relationship("Course", back_populates="sections")
-    content_blocks = relationship("ContentBlock", back_populates="section")
+    content_blocks = relationship(
+        "ContentBlock", back_populates="section", passive_deletes=True
+    )
 
 
 class ContentBlock(Timestamp, Base):
@@ -57,12 +77,18 @@ class ContentBlock(Timestamp, Base):
     description = Column(Text, nullable=True)
     type = Column(Enum(ContentType), nullable=False)
     url = Column(URLType, nullable=True)
-    content = Column(Text, nullable=True)
-    section_id = Column(Integer, ForeignKey("sections.id"), nullable=False)
+    # Lesson bodies live in the blob store, addressed by their SHA-256
+    content_hash = Column(String(64), nullable=True, index=True)
+    content_size = Column(Integer, nullable=True)
+    section_id = Column(
+        Integer, ForeignKey("sections.id", ondelete="CASCADE"), nullable=False
+    )
 
     section = relationship("Section", back_populates="content_blocks")
     completed_content_blocks = relationship(
-        "CompletedContentBlock", back_populates="content_block"
+        "CompletedContentBlock",
+        back_populates="content_block",
+        passive_deletes=True,
     )
 
 
@@ -73,7 +99,9 @@ class StudentCourse(Timestamp, Base):
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(
+        Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False
+    )
     completed = Column(Boolean, default=False)
 
     student = relationship(User, back_populates="student_courses")
@@ -81,13 +109,34 @@ class StudentCourse(Timestamp, Base):
 
 
 class CompletedContentBlock(Timestamp, Base):
-    """CompletedContentBlock model tracking student progress on content."""
+    """CompletedContentBlock model tracking student progress on content.
+
+    On PostgreSQL the table is range-partitioned by `created_at` per term;
+    see `db.archive` for partition maintenance and archival.
+    """
 
     __tablename__ = "completed_content_blocks"
+    __table_args__ = (
+        # Covers the per-block, current-term counts of course analytics
+        Index(
+            "ix_completed_content_blocks_block_term",
+            "content_block_id",
+            "created_at",
+            "student_id",
+        ),
+        # Never reuse ids of rows moved to the archive table on SQLite
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    content_block_id = Column(Integer, ForeignKey("content_blocks.id"), nullable=False)
+    student_id = Column(
+        Integer, ForeignKey("users.id"), nullable=False, index=True
+    )
+    content_block_id = Column(
+        Integer,
+        ForeignKey("content_blocks.id", ondelete="CASCADE"),
+        nullable=False,
+    )
     url = Column(URLType, nullable=True)
     feedback = Column(Text, nullable=True)
     grade = Column(Integer, default=0)
@@ -95,4 +144,16 @@ class CompletedContentBlock(Timestamp, Base):
     student = relationship(User, back_populates="student_content_blocks")
     content_block = relationship(
         ContentBlock, back_populates="completed_content_blocks"
-    )
\ No newline at end of file
+    )
+
+
+class CourseAnalytics(Base):
+    """Precomputed analytics snapshot for a course."""
+
+    __tablename__ = "course_analytics"
+
+    course_id = Column(
+        Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True
+    )
+    data = Column(JSON, nullable=False)
+    computed_at = Column(DateTime, nullable=False)
@@ -0,0 +1,354 @@
+"""Bulk fixture seeding for development, benchmarks and tests.
+
+Rows are generated with explicit primary keys and written with
+executemany INSERTs in batches, so large volumes load in seconds on
+SQLite as well as PostgreSQL.
+
+Usage:
+    python -m db.seed [--teachers N] [--students N] [--courses N] ...
+
+An in-memory database only lives as long as its process, so seed one by
+calling `seed()` from the process that uses it rather than from the CLI.
+"""
+
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from db.archive import current_term_start
+from db.blob_store import get_blob_store
+from db.db_setup import Base, engine
+from db.models.course import (
+    CompletedContentBlock,
+    ContentBlock,
+    ContentType,
+    Course,
+    Section,
+    StudentCourse,
+)
+from db.models.user import Profile, Role, User
+
+BATCH_SIZE = 10_000
+
+FIRST_NAMES = [
+    "Aisha", "Ben", "Chen", "Diego", "Emma", "Fatima", "George", "Hana",
+    "Ivan", "Jade", "Kofi", "Lena", "Mohammed", "Nora", "Omar", "Priya",
+]
+LAST_NAMES = [
+    "Ahmed", "Brown", "Garcia", "Ivanova", "Khan", "Kim", "Lopez", "Mensah",
+    "Novak", "Okafor", "Patel", "Rossi", "Smith", "Tanaka", "Weber", "Zhang",
+]
+TOPICS = [
+    "Algebra", "Biology", "Chemistry", "Databases", "Economics",
+    "French", "Geometry", "History", "Physics", "Statistics",
+]
+CONTENT_TYPES = [ContentType.lesson] * 6 + [
+    ContentType.quiz,
+    ContentType.quiz,
+    ContentType.assignment,
+]
+
+
+@dataclass
+class SeedConfig:
+    """Volumes of generated fixtures."""
+
+    teachers: int = 20
+    students: int = 5_000
+    courses: int = 20
+    sections_per_course: int = 5
+    blocks_per_section: int = 8
+    students_per_course: int = 500
+    completion_rate: float = 0.6
+    lesson_bodies: int = 5
+    seed: int = 0
+
+    def __post_init__(self):
+        """Reject volumes that cannot be generated."""
+        for name, value in asdict(self).items():
+            if value < 0:
+                raise ValueError(f"{name} cannot be negative")
+        if not 0 <= self.completion_rate <= 1:
+            raise ValueError("completion_rate must be between 0 and 1")
+        if self.courses and not self.teachers:
+            raise ValueError("courses need at least one teacher")
+        if (
+            self.courses
+            and self.students_per_course
+            and self.students
+            and not self.sections_per_course * self.blocks_per_section
+        ):
+            raise ValueError(
+                "completions need at least one section with one content block"
+            )
+
+
+def _next_id(conn: Connection, table: Table) -> int:
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _insert(conn: Connection, table: Table, rows: Iterable[Dict]) -> int:
+    """Insert rows in batches and return how many were written."""
+    count = 0
+    batch: List[Dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            conn.execute(insert(table), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+
+def _reset_sequence(conn: Connection, table: Table) -> None:
+    """Move a PostgreSQL id sequence past explicitly inserted keys."""
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+        )
+    )
+
+
+def seed(bind: Engine = engine, config: Optional[SeedConfig] = None) -> Dict:
+    """Generate users, profiles, courses, sections, blocks and completions.
+
+    Returns the number of rows inserted per table.
+    """
+    config = config or SeedConfig()
+    rng = random.Random(config.seed)
+    now = datetime.utcnow()
+    term_start = current_term_start()
+    term_seconds = max(int((now - term_start).total_seconds()), 1)
+
+    def moment() -> datetime:
+        return term_start + timedelta(seconds=rng.randrange(term_seconds))
+
+    counts = {}
+    with bind.begin() as conn:
+        tables = [
+            User.__table__,
+            Profile.__table__,
+            Course.__table__,
+            Section.__table__,
+            ContentBlock.__table__,
+            StudentCourse.__table__,
+            CompletedContentBlock.__table__,
+        ]
+        first = {table.name: _next_id(conn, table) for table in tables}
+
+        user_count = config.teachers + config.students
+        teacher_ids = range(first["users"], first["users"] + config.teachers)
+        student_ids = range(
+            first["users"] + config.teachers, first["users"] + user_count
+        )
+
+        def users() -> Iterator[Dict]:
+            for user_id in range(first["users"], first["users"] + user_count):
+                created = moment()
+                role = Role.teacher if user_id in teacher_ids else Role.student
+                yield {
+                    "id": user_id,
+                    "email": f"user{user_id}@example.com",
+                    "role": role,
+                    "is_active": rng.random() < 0.9,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+
+        def profiles() -> Iterator[Dict]:
+            for offset in range(user_count):
+                yield {
+                    "id": first["profiles"] + offset,
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "last_name": rng.choice(LAST_NAMES),
+                    "bio": None,
+                    "user_id": first["users"] + offset,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+
+        counts["users"] = _insert(conn, User.__table__, users())
+        counts["profiles"] = _insert(conn, Profile.__table__, profiles())
+
+        course_ids = range(first["courses"], first["courses"] + config.courses)
+        counts["courses"] = _insert(
+            conn,
+            Course.__table__,
+            (
+                {
+                    "id": course_id,
+                    "title": f"{rng.choice(TOPICS)} {100 + course_id}",
+                    "description": None,
+                    "user_id": rng.choice(teacher_ids),
+                    "version": 1,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for course_id in course_ids
+            ),
+        )
+
+        # Sections and blocks are numbered contiguously per course
+        sections = {}
+        blocks = {}
+        section_id = first["sections"]
+        block_id = first["content_blocks"]
+        for course_id in course_ids:
+            sections[course_id] = []
+            for _ in range(config.sections_per_course):
+                sections[course_id].append(section_id)
+                blocks[section_id] = list(
+                    range(block_id, block_id + config.blocks_per_section)
+                )
+                block_id += config.blocks_per_section
+                section_id += 1
+
+        counts["sections"] = _insert(
+            conn,
+            Section.__table__,
+            (
+                {
+                    "id": section_id,
+                    "title": f"Week {position + 1}",
+                    "description": None,
+                    "course_id": course_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for course_id, section_ids in sections.items()
+                for position, section_id in enumerate(section_ids)
+            ),
+        )
+
+        # Lessons share a few bodies, which the blob store deduplicates
+        store = get_blob_store()
+        bodies = []
+        for index in range(config.lesson_bodies):
+            data = (
+                f"<h1>Lesson {index + 1}</h1>"
+                + f"<p>{rng.choice(TOPICS)} notes.</p>" * 200
+            ).encode("utf-8")
+            bodies.append((store.put(data), len(data)))
+
+        def content_blocks() -> Iterator[Dict]:
+            for section_id, block_ids in blocks.items():
+                for position, block_id in enumerate(block_ids):
+                    block_type = rng.choice(CONTENT_TYPES)
+                    body = (None, None)
+                    if bodies and block_type == ContentType.lesson:
+                        body = rng.choice(bodies)
+                    yield {
+                        "id": block_id,
+                        "title": f"Block {position + 1}",
+                        "description": None,
+                        "type": block_type,
+                        "url": None,
+                        "content_hash": body[0],
+                        "content_size": body[1],
+                        "section_id": section_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+
+        counts["content_blocks"] = _insert(
+            conn, ContentBlock.__table__, content_blocks()
+        )
+
+        enrollments = {
+            course_id: rng.sample(
+                student_ids, min(config.students_per_course, len(student_ids))
+            )
+            for course_id in course_ids
+        }
+
+        def student_courses() -> Iterator[Dict]:
+            enrollment_id = first["student_courses"]
+            for course_id, students in enrollments.items():
+                for student_id in students:
+                    created = moment()
+                    yield {
+                        "id": enrollment_id,
+                        "student_id": student_id,
+                        "course_id": course_id,
+                        "completed": rng.random() < config.completion_rate / 2,
+                        "created_at": created,
+                        "updated_at": created,
+                    }
+                    enrollment_id += 1
+
+        def completions() -> Iterator[Dict]:
+            completion_id = first["completed_content_blocks"]
+            for course_id, students in enrollments.items():
+                course_blocks = [
+                    block
+                    for section in sections[course_id]
+                    for block in blocks[section]
+                ]
+                # Students work through blocks in order and drop off, so
+                # completion_rate of them reach the last block
+                keep_going = config.completion_rate ** (1 / len(course_blocks))
+                for student_id in students:
+                    for block in course_blocks:
+                        if rng.random() > keep_going:
+                            break
+                        created = moment()
+                        yield {
+                            "id": completion_id,
+                            "student_id": student_id,
+                            "content_block_id": block,
+                            "url": None,
+                            "feedback": None,
+                            "grade": min(100, max(0, int(rng.gauss(72, 15)))),
+                            "created_at": created,
+                            "updated_at": created,
+                        }
+                        completion_id += 1
+
+        counts["student_courses"] = _insert(
+            conn, StudentCourse.__table__, student_courses()
+        )
+        counts["completed_content_blocks"] = _insert(
+            conn, CompletedContentBlock.__table__, completions()
+        )
+        for table in tables:
+            _reset_sequence(conn, table)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m db.seed")
+    for name, default in asdict(SeedConfig()).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(default), default=default
+        )
+    parser.add_argument(
+        "--create-tables",
+        action="store_true",
+        help="Create missing tables from the models first",
+    )
+    args = vars(parser.parse_args(argv))
+    create_tables = args.pop("create_tables")
+    try:
+        config = SeedConfig(**args)
+    except ValueError as e:
+        parser.error(str(e))
+    if create_tables:
+        Base.metadata.create_all(bind=engine)
+    for table, count in seed(config=config).items():
+        print(f"{table}: {count}")
+
+
+if __name__ == "__main__":
+    main()
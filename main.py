@@ -3,7 +3,8 @@
 from fastapi import FastAPI
 
 from api import users, courses, sections
-from db.db_setup import engine
+from api.utils.single_flight import single_flight_stats
+from db.db_setup import async_engine, engine
 from db.models import user, course
 
 # Create database tables
@@ -24,12 +25,29 @@ app = FastAPI(
 )
 
 # Include API routers
-app.include_router(users.router, prefix="/api", tags=["users"])
-app.include_router(courses.router, prefix="/api", tags=["courses"])
-app.include_router(sections.router, prefix="/api", tags=["sections"])
+app.include_router(users.router, prefix="/api/users", tags=["users"])
+app.include_router(courses.router, prefix="/api/courses", tags=["courses"])
+app.include_router(sections.router, prefix="/api/sections", tags=["sections"])
+app.include_router(
+    sections.content_blocks_router,
+    prefix="/api/content-blocks",
+    tags=["sections"],
+)
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """Close pooled async connections, including aiosqlite worker threads."""
+    await async_engine.dispose()
 
 
 @app.get("/health", tags=["health"])
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics/single-flight", tags=["health"])
+async def single_flight_metrics():
+    """Counters for coalesced read requests per route."""
+    return single_flight_stats()
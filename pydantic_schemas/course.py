@@ -1,7 +1,8 @@
 """Pydantic schemas for Course models."""
 
-from typing import Optional
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, field_validator
 
 
 class CourseBase(BaseModel):
@@ -18,12 +19,75 @@ class CourseCreate(CourseBase):
     pass
 
 
+class CourseUpdate(BaseModel):
+    """Schema for partially updating a course."""
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+    @field_validator("title")
+    @classmethod
+    def title_not_null(cls, value: Optional[str]) -> str:
+        """Allow omitting the title but not clearing it."""
+        if value is None:
+            raise ValueError("title cannot be null")
+        return value
+
+
 class Course(CourseBase):
     """Schema for course response."""
 
     id: int
+    version: int
+
+    class Config:
+        """Pydantic configuration."""
+
+        from_attributes = True
+
+
+class GradeBucket(BaseModel):
+    """Number of completions with a given grade."""
+
+    grade: int
+    count: int
+
+
+class SectionFunnel(BaseModel):
+    """Number of students who completed any content in a section."""
+
+    section_id: int
+    students: int
+
+
+class ContentBlockDropOff(BaseModel):
+    """Students completing a content block and those lost since the last."""
+
+    content_block_id: int
+    section_id: int
+    students: int
+    drop_off: int
+
+
+class CourseAnalyticsData(BaseModel):
+    """Aggregated course statistics."""
+
+    enrolled: int
+    completed: int
+    grade_distribution: List[GradeBucket]
+    grade_percentiles: Dict[str, int]
+    sections: List[SectionFunnel]
+    content_blocks: List[ContentBlockDropOff]
+
+
+class CourseAnalytics(BaseModel):
+    """Schema for course analytics snapshot response."""
+
+    course_id: int
+    data: CourseAnalyticsData
+    computed_at: datetime
 
     class Config:
         """Pydantic configuration."""
 
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
@@ -0,0 +1,48 @@
+"""Shared fixtures running the application on in-memory SQLite."""
+
+import os
+import tempfile
+
+# Configure the engines before any application module is imported
+os.environ["DATABASE_URL"] = (
+    "sqlite:///file:lms_test?mode=memory&cache=shared&uri=true"
+)
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["BLOB_STORE_DIR"] = tempfile.mkdtemp(prefix="lms-blobs-")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from db.archive import archive_table
+from db.db_setup import Base, engine
+from main import app
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Give every test empty tables."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    archive_table.drop(bind=engine, checkfirst=True)
+
+
+@pytest.fixture
+def client():
+    """Test client for the application."""
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def statements():
+    """Record every SQL statement run on the synchronous engine."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
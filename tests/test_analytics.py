@@ -0,0 +1,87 @@
+"""Tests for the course analytics snapshots."""
+
+from datetime import timedelta
+
+from sqlalchemy import update
+
+from api.utils import analytics
+from db.db_setup import SessionLocal
+from db.models.course import CompletedContentBlock, StudentCourse
+from db.seed import SeedConfig, seed
+
+
+def seed_courses(courses=1, students=10):
+    seed(
+        config=SeedConfig(
+            teachers=1,
+            students=students,
+            courses=courses,
+            sections_per_course=2,
+            blocks_per_section=3,
+            students_per_course=students,
+            completion_rate=0.5,
+            lesson_bodies=0,
+        )
+    )
+
+
+def test_refresh_upserts_snapshot():
+    seed_courses()
+    db = SessionLocal()
+    try:
+        first = analytics.refresh_course_analytics(db, 1)
+        second = analytics.refresh_course_analytics(db, 1)
+        assert second.computed_at >= first.computed_at
+        assert second.data["enrolled"] == 10
+        assert analytics.get_course_analytics(db, 1).computed_at == (
+            second.computed_at
+        )
+    finally:
+        db.close()
+
+
+def test_refresh_stale_skips_failing_course(monkeypatch):
+    seed_courses(courses=2)
+    build = analytics.build_course_analytics
+
+    def fail_first(db, course_id):
+        if course_id == 1:
+            raise RuntimeError("boom")
+        return build(db, course_id)
+
+    monkeypatch.setattr(analytics, "build_course_analytics", fail_first)
+    db = SessionLocal()
+    try:
+        assert analytics.refresh_stale_course_analytics(db, max_age=0) == 1
+        assert analytics.get_course_analytics(db, 1) is None
+        assert analytics.get_course_analytics(db, 2) is not None
+    finally:
+        db.close()
+
+
+def test_missing_snapshot_is_built_on_read(client):
+    seed_courses()
+    response = client.get("/api/courses/1/analytics")
+    assert response.status_code == 200
+    assert response.json()["data"]["enrolled"] == 10
+    assert client.get("/api/courses/2/analytics").status_code == 404
+
+
+def test_enrollments_from_closed_terms_are_excluded():
+    seed_courses()
+    db = SessionLocal()
+    try:
+        previous_term = analytics.current_term_start() - timedelta(days=1)
+        for model in (StudentCourse, CompletedContentBlock):
+            db.execute(
+                update(model)
+                .where(model.student_id == 2)
+                .values(created_at=previous_term)
+            )
+        db.commit()
+        data = analytics.build_course_analytics(db, 1)
+        assert data["enrolled"] == 9
+        first_block = data["content_blocks"][0]
+        assert first_block["drop_off"] == 9 - first_block["students"]
+    finally:
+        db.close()
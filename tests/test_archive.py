@@ -0,0 +1,117 @@
+"""Tests for archiving closed terms of completion history."""
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from db import archive
+from db.archive import archive_closed_terms, archive_table
+from db.db_setup import engine
+from db.models.course import CompletedContentBlock
+from db.seed import SeedConfig, seed
+
+
+def add_completion(created_at):
+    with Session(engine) as db:
+        db.add(
+            CompletedContentBlock(
+                student_id=2,
+                content_block_id=1,
+                grade=80,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+        db.commit()
+
+
+def read_archive(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_late_rows_do_not_overwrite_earlier_archives(tmp_path):
+    seed(
+        config=SeedConfig(
+            teachers=1,
+            students=1,
+            courses=1,
+            sections_per_course=1,
+            blocks_per_section=1,
+            students_per_course=0,
+            lesson_bodies=0,
+        )
+    )
+    add_completion(datetime(2024, 2, 1))
+    add_completion(datetime(2024, 3, 1))
+    first = archive_closed_terms(out_dir=str(tmp_path))
+    assert [count for _, count in first] == [2]
+
+    add_completion(datetime(2024, 4, 1))
+    second = archive_closed_terms(out_dir=str(tmp_path))
+    assert [count for _, count in second] == [1]
+
+    assert first[0][0] != second[0][0]
+    assert len(os.listdir(tmp_path)) == 2
+    assert len(read_archive(first[0][0])) == 2
+    assert len(read_archive(second[0][0])) == 1
+
+    with engine.connect() as conn:
+        archived = conn.execute(
+            select(func.count()).select_from(archive_table)
+        ).scalar()
+        live = conn.execute(
+            select(func.count()).select_from(CompletedContentBlock.__table__)
+        ).scalar()
+    assert archived == 3
+    assert live == 0
+
+
+def test_failed_run_leaves_no_archive_files(tmp_path, monkeypatch):
+    seed(
+        config=SeedConfig(
+            teachers=1,
+            students=1,
+            courses=1,
+            sections_per_course=1,
+            blocks_per_section=1,
+            students_per_course=0,
+            lesson_bodies=0,
+        )
+    )
+    add_completion(datetime(2024, 2, 1))
+    add_completion(datetime(2024, 8, 1))
+    export = archive._export_term
+    calls = []
+
+    def fail_second_term(*args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return export(*args)
+
+    monkeypatch.setattr(archive, "_export_term", fail_second_term)
+    with pytest.raises(RuntimeError):
+        archive_closed_terms(
+            before=datetime(2025, 1, 1), out_dir=str(tmp_path)
+        )
+    assert os.listdir(tmp_path) == []
+    with engine.connect() as conn:
+        live = conn.execute(
+            select(func.count()).select_from(CompletedContentBlock.__table__)
+        ).scalar()
+    assert live == 2
+
+    monkeypatch.setattr(archive, "_export_term", export)
+    archived = archive_closed_terms(
+        before=datetime(2025, 1, 1), out_dir=str(tmp_path)
+    )
+    assert [count for _, count in archived] == [1, 1]
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(path) for path, _ in archived
+    )
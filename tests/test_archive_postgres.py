@@ -0,0 +1,226 @@
+"""PostgreSQL-only tests for term partitions, migrations and archival.
+
+They run against a server given by TEST_POSTGRES_URL, e.g.
+    TEST_POSTGRES_URL=postgresql+psycopg2://postgres@localhost/postgres
+and are skipped without it. Each test migrates a fresh database.
+"""
+
+import os
+import uuid
+from datetime import timedelta
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from db.archive import (
+    DEFAULT_PARTITION,
+    archive_closed_terms,
+    current_term_start,
+    ensure_partitions,
+    next_term,
+    partition_name,
+    term_start,
+)
+from db.blob_store import get_blob_store
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = "f94b958596d0"
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set"
+)
+
+
+@pytest.fixture
+def postgres():
+    """Create a database at the baseline revision and drop it afterwards."""
+    server = make_url(TEST_POSTGRES_URL)
+    name = f"lms_test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(server, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f"CREATE DATABASE {name}"))
+    url = server.set(database=name).render_as_string(hide_password=False)
+    engine = create_engine(url)
+    # The baseline migration adds enum columns without creating their types
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TYPE role AS ENUM ('teacher', 'student')"))
+        conn.execute(
+            text(
+                "CREATE TYPE contenttype AS ENUM "
+                "('lesson', 'quiz', 'assignment')"
+            )
+        )
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, BASELINE)
+    try:
+        yield engine, config
+    finally:
+        engine.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f"DROP DATABASE {name} WITH (FORCE)"))
+        admin.dispose()
+
+
+def add_course(conn, body="<p>Lesson</p>"):
+    """Insert a teacher, student, course, section and content block."""
+    conn.execute(
+        text(
+            "INSERT INTO users (id, email, role, is_active, created_at, "
+            "updated_at) VALUES (9001, 't@example.com', 'teacher', true, "
+            "now(), now()), (9002, 's@example.com', 'student', true, now(), "
+            "now())"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO courses (id, title, user_id, created_at, updated_at) "
+            "VALUES (1, 'Course', 9001, now(), now())"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO sections (id, title, course_id, created_at, "
+            "updated_at) VALUES (1, 'Week 1', 1, now(), now())"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO content_blocks (id, title, type, content, "
+            "section_id, created_at, updated_at) VALUES (1, 'Block', "
+            "'lesson', :body, 1, now(), now())"
+        ),
+        {"body": body},
+    )
+
+
+def add_completion(conn, created_at):
+    conn.execute(
+        text(
+            "INSERT INTO completed_content_blocks (student_id, "
+            "content_block_id, grade, created_at, updated_at) "
+            "VALUES (9002, 1, 80, :at, :at)"
+        ),
+        {"at": created_at},
+    )
+
+
+def partition_of(conn):
+    """Map each completion's created_at to the partition holding it."""
+    rows = conn.execute(
+        text(
+            "SELECT created_at, tableoid::regclass::text "
+            "FROM completed_content_blocks"
+        )
+    )
+    return {created_at: partition for created_at, partition in rows}
+
+
+def test_migrations_partition_rows_and_move_bodies(postgres):
+    engine, config = postgres
+    now = current_term_start() + timedelta(days=1)
+    past = term_start(current_term_start() - timedelta(days=200))
+    with engine.begin() as conn:
+        add_course(conn)
+        add_completion(conn, past)
+        add_completion(conn, now)
+
+    command.upgrade(config, "head")
+
+    with engine.begin() as conn:
+        assert partition_of(conn) == {
+            past: partition_name(past),
+            now: partition_name(current_term_start()),
+        }
+        digest, size = conn.execute(
+            text("SELECT content_hash, content_size FROM content_blocks")
+        ).one()
+        assert get_blob_store().get(digest) == b"<p>Lesson</p>"
+        assert size == len(b"<p>Lesson</p>")
+        # Deleting the course cascades down to the partitioned completions
+        conn.execute(text("DELETE FROM courses"))
+        count = conn.execute(
+            text("SELECT count(*) FROM completed_content_blocks")
+        ).scalar()
+        assert count == 0
+
+
+def test_downgrade_restores_plain_table(postgres):
+    engine, config = postgres
+    with engine.begin() as conn:
+        add_course(conn)
+        add_completion(conn, current_term_start() + timedelta(days=1))
+    command.upgrade(config, "head")
+    command.downgrade(config, BASELINE)
+    with engine.connect() as conn:
+        assert conn.execute(
+            text("SELECT content FROM content_blocks")
+        ).scalar() == "<p>Lesson</p>"
+        assert conn.execute(
+            text("SELECT count(*) FROM completed_content_blocks")
+        ).scalar() == 1
+        partitioned = conn.execute(
+            text(
+                "SELECT count(*) FROM pg_partitioned_table p JOIN pg_class c "
+                "ON c.oid = p.partrelid "
+                "WHERE c.relname = 'completed_content_blocks'"
+            )
+        ).scalar()
+        assert partitioned == 0
+
+
+def test_ensure_partitions_moves_stranded_rows(postgres):
+    engine, config = postgres
+    with engine.begin() as conn:
+        add_course(conn)
+    command.upgrade(config, "head")
+
+    later = next_term(next_term(next_term(current_term_start())))
+    earlier = term_start(current_term_start() - timedelta(days=800))
+    with engine.begin() as conn:
+        add_completion(conn, later)
+        add_completion(conn, earlier)
+        assert set(partition_of(conn).values()) == {DEFAULT_PARTITION}
+
+    created = ensure_partitions(bind=engine, ahead=3)
+    assert partition_name(later) in created
+    assert partition_name(earlier) in created
+    with engine.connect() as conn:
+        assert partition_of(conn) == {
+            later: partition_name(later),
+            earlier: partition_name(earlier),
+        }
+    assert ensure_partitions(bind=engine, ahead=3) == []
+
+
+def test_archive_drops_closed_partitions(postgres, tmp_path):
+    engine, config = postgres
+    with engine.begin() as conn:
+        add_course(conn)
+    command.upgrade(config, "head")
+
+    current = current_term_start() + timedelta(days=1)
+    closed = term_start(current_term_start() - timedelta(days=1))
+    with engine.begin() as conn:
+        add_completion(conn, closed)
+        add_completion(conn, closed + timedelta(days=1))
+        add_completion(conn, current)
+    ensure_partitions(bind=engine)
+
+    archived = archive_closed_terms(bind=engine, out_dir=str(tmp_path))
+    assert [count for _, count in archived] == [2]
+    assert os.path.basename(archived[0][0]).startswith(partition_name(closed))
+    with engine.connect() as conn:
+        assert partition_of(conn) == {
+            current: partition_name(current_term_start())
+        }
+        exists = conn.execute(
+            text("SELECT to_regclass(:name)"), {"name": partition_name(closed)}
+        ).scalar()
+        assert exists is None
+    assert archive_closed_terms(bind=engine, out_dir=str(tmp_path)) == []
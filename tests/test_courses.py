@@ -0,0 +1,108 @@
+"""Tests for the course routes."""
+
+from sqlalchemy import func, select
+
+from db.db_setup import engine
+from db.models.course import (
+    CompletedContentBlock,
+    ContentBlock,
+    Course,
+    Section,
+    StudentCourse,
+)
+from db.seed import SeedConfig, seed
+
+
+def seed_course(blocks_per_section=1, students=0):
+    seed(
+        config=SeedConfig(
+            teachers=1,
+            students=students,
+            courses=1,
+            sections_per_course=1,
+            blocks_per_section=blocks_per_section,
+            students_per_course=students,
+            completion_rate=1.0,
+            lesson_bodies=0,
+        )
+    )
+
+
+def test_patch_rejects_null_title(client):
+    seed_course()
+    response = client.patch("/api/courses/1", json={"title": None})
+    assert response.status_code == 422
+    assert client.get("/api/courses/1").json()["version"] == 1
+
+
+def count_rows(table):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(table)).scalar()
+
+
+def test_patch_is_one_statement(client, statements):
+    seed_course(blocks_per_section=5000)
+    statements.clear()
+    response = client.patch(
+        "/api/courses/1", json={"title": "Renamed"}, headers={"If-Match": '"1"'}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.headers["ETag"] == '"2"'
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE courses")
+
+
+def test_patch_with_stale_version_fails(client):
+    seed_course()
+    client.patch("/api/courses/1", json={"title": "First"})
+    response = client.patch(
+        "/api/courses/1", json={"title": "Second"}, headers={"If-Match": '"1"'}
+    )
+    assert response.status_code == 412
+    assert client.get("/api/courses/1").json()["title"] == "First"
+
+
+def test_if_match_uses_strong_comparison(client):
+    seed_course()
+    response = client.patch(
+        "/api/courses/1", json={"title": "Weak"}, headers={"If-Match": 'W/"1"'}
+    )
+    assert response.status_code == 412
+    assert client.get("/api/courses/1").json()["version"] == 1
+
+
+def test_if_match_accepts_any_listed_version(client):
+    seed_course()
+    client.patch("/api/courses/1", json={"title": "Second"})
+    client.patch("/api/courses/1", json={"title": "Third"})
+    response = client.patch(
+        "/api/courses/1",
+        json={"title": "Fourth"},
+        headers={"If-Match": '"1", W/"3", "3"'},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"4"'
+    response = client.delete(
+        "/api/courses/1", headers={"If-Match": '"1", "2"'}
+    )
+    assert response.status_code == 412
+
+
+def test_delete_is_one_statement_and_cascades(client, statements):
+    seed_course(blocks_per_section=5000, students=3)
+    assert count_rows(CompletedContentBlock.__table__) > 0
+    statements.clear()
+    response = client.delete("/api/courses/1", headers={"If-Match": '"1"'})
+    assert response.status_code == 204
+    assert len(statements) == 1
+    assert statements[0].startswith("DELETE FROM courses")
+    for model in (
+        Course,
+        Section,
+        ContentBlock,
+        StudentCourse,
+        CompletedContentBlock,
+    ):
+        assert count_rows(model.__table__) == 0
+    assert client.delete("/api/courses/1").status_code == 404
@@ -0,0 +1,52 @@
+"""Tests for the database engine setup."""
+
+import asyncio
+
+import httpx
+
+from db.seed import SeedConfig, seed
+from main import app
+
+ROUNDS = 200
+
+
+def test_in_memory_mode_isolates_concurrent_requests(client):
+    seed(
+        config=SeedConfig(
+            teachers=1,
+            students=5,
+            courses=1,
+            sections_per_course=1,
+            blocks_per_section=2,
+            students_per_course=5,
+            lesson_bodies=0,
+        )
+    )
+
+    async def fire():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as ac:
+            requests = []
+            for i in range(ROUNDS):
+                requests += [
+                    ac.patch("/api/courses/1", json={"title": f"Title {i}"}),
+                    ac.get("/api/courses"),
+                    ac.get("/api/courses/1/analytics"),
+                    ac.post(
+                        "/api/courses",
+                        json={"title": f"Course {i}", "user_id": 1},
+                    ),
+                ]
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(fire())
+
+    assert [r.status_code for r in responses if r.status_code >= 500] == []
+    patches = responses[0::4]
+    assert all(r.status_code == 200 for r in patches)
+    assert client.get("/api/courses/1").json()["version"] == 1 + ROUNDS
+    assert len(client.get("/api/courses", params={"limit": 1000}).json()) == (
+        1 + ROUNDS
+    )
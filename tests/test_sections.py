@@ -0,0 +1,115 @@
+"""Tests for the content block body routes."""
+
+import os
+
+from api.utils.sections import set_content_block_body
+from db.blob_store import get_blob_store
+from db.db_setup import SessionLocal
+from db.seed import SeedConfig, seed
+
+BODY = "<h1>Lesson</h1>" + "<p>Notes.</p>" * 100
+
+
+def seed_block(body=BODY):
+    seed(
+        config=SeedConfig(
+            teachers=1,
+            students=0,
+            courses=1,
+            sections_per_course=1,
+            blocks_per_section=1,
+            students_per_course=0,
+            lesson_bodies=0,
+        )
+    )
+    db = SessionLocal()
+    try:
+        return set_content_block_body(
+            db=db, block_id=1, body=body.encode("utf-8")
+        )
+    finally:
+        db.close()
+
+
+def test_body_has_one_charset(client):
+    seed_block()
+    response = client.get("/api/content-blocks/1/body")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+    assert response.text == BODY
+
+
+def test_body_range(client):
+    seed_block()
+    response = client.get(
+        "/api/content-blocks/1/body", headers={"Range": "bytes=4-7"}
+    )
+    assert response.status_code == 206
+    assert response.text == BODY[4:8]
+    assert response.headers["Content-Range"] == f"bytes 4-7/{len(BODY)}"
+
+    response = client.get(
+        "/api/content-blocks/1/body", headers={"Range": "bytes=-5"}
+    )
+    assert response.status_code == 206
+    assert response.text == BODY[-5:]
+
+
+def test_body_ignores_unsupported_ranges(client):
+    seed_block()
+    for value in ("bytes=0-1,4-5", "items=0-1", "bytes=5-2", "bytes=abc"):
+        response = client.get(
+            "/api/content-blocks/1/body", headers={"Range": value}
+        )
+        assert response.status_code == 200, value
+        assert response.text == BODY
+
+
+def test_body_range_past_end(client):
+    seed_block()
+    for value in (f"bytes={len(BODY)}-", "bytes=-0"):
+        response = client.get(
+            "/api/content-blocks/1/body", headers={"Range": value}
+        )
+        assert response.status_code == 416, value
+        assert response.headers["Content-Range"] == f"bytes */{len(BODY)}"
+
+
+def test_body_not_modified(client):
+    seed_block()
+    etag = client.get("/api/content-blocks/1/body").headers["ETag"]
+    response = client.get(
+        "/api/content-blocks/1/body", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_replace_body(client):
+    seed_block()
+    old_etag = client.get("/api/content-blocks/1/body").headers["ETag"]
+    response = client.put(
+        "/api/content-blocks/1/body",
+        content="<p>New</p>",
+        headers={"Content-Type": "text/html"},
+    )
+    assert response.status_code == 204
+    assert response.headers["ETag"] != old_etag
+    response = client.get("/api/content-blocks/1/body")
+    assert response.text == "<p>New</p>"
+    assert response.headers["ETag"] != old_etag
+
+    response = client.put("/api/content-blocks/2/body", content="<p>New</p>")
+    assert response.status_code == 404
+    response = client.put("/api/content-blocks/1/body", content=b"\xff")
+    assert response.status_code == 400
+
+
+def test_missing_blob_is_an_error_not_a_truncated_body(client):
+    digest = seed_block()
+    store = get_blob_store()
+    os.remove(store._path(digest))
+    response = client.get("/api/content-blocks/1/body")
+    assert response.status_code == 500
+    assert response.json()["detail"] == (
+        "Content block body is missing from storage"
+    )
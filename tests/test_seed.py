@@ -0,0 +1,44 @@
+"""Tests for the fixture seeder."""
+
+import pytest
+
+from db.seed import SeedConfig, main, seed
+
+
+def test_seed_counts():
+    counts = seed(
+        config=SeedConfig(
+            teachers=2,
+            students=10,
+            courses=3,
+            sections_per_course=2,
+            blocks_per_section=2,
+            students_per_course=4,
+            lesson_bodies=1,
+        )
+    )
+    assert counts["users"] == 12
+    assert counts["courses"] == 3
+    assert counts["content_blocks"] == 12
+    assert counts["student_courses"] == 12
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"teachers": 0},
+        {"students": -1},
+        {"completion_rate": 1.5},
+        {"blocks_per_section": 0},
+    ],
+)
+def test_invalid_config_is_rejected(options):
+    with pytest.raises(ValueError):
+        SeedConfig(**options)
+
+
+def test_cli_reports_invalid_config(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--teachers", "0"])
+    assert exit_info.value.code == 2
+    assert "courses need at least one teacher" in capsys.readouterr().err
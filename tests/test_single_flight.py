@@ -0,0 +1,109 @@
+"""Tests for coalescing identical concurrent reads."""
+
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import event
+
+from api.courses import course_flight
+from api.utils.single_flight import SingleFlight
+from db.db_setup import engine
+from db.seed import SeedConfig, seed
+from main import app
+
+REQUESTS = 1000
+
+
+def test_concurrent_identical_course_reads_run_one_query(client):
+    seed(
+        config=SeedConfig(
+            teachers=1,
+            students=0,
+            courses=1,
+            sections_per_course=1,
+            blocks_per_section=1,
+            lesson_bodies=0,
+        )
+    )
+    coalesced_before = course_flight.coalesced
+    course_queries = []
+
+    def hold_leader(conn, cursor, statement, parameters, context, many):
+        if "FROM courses" not in statement:
+            return
+        course_queries.append(statement)
+        # Keep the query in flight until every other request has joined it
+        deadline = time.monotonic() + 10
+        while course_flight.coalesced - coalesced_before < REQUESTS - 1:
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+
+    async def fire():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as ac:
+            return await asyncio.gather(
+                *[ac.get("/api/courses/1") for _ in range(REQUESTS)]
+            )
+
+    event.listen(engine, "before_cursor_execute", hold_leader)
+    try:
+        responses = asyncio.run(fire())
+    finally:
+        event.remove(engine, "before_cursor_execute", hold_leader)
+
+    assert all(r.status_code == 200 for r in responses)
+    assert {r.json()["id"] for r in responses} == {1}
+    assert len(course_queries) == 1
+
+    metrics = client.get("/metrics/single-flight").json()["read_course"]
+    assert metrics["coalesced"] - coalesced_before == REQUESTS - 1
+    assert metrics["in_flight"] == 0
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    async def run():
+        flight = SingleFlight("test")
+
+        async def slow_read():
+            await asyncio.sleep(0.05)
+            return "course"
+
+        leader = asyncio.create_task(flight.do(1, slow_read))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(flight.do(1, slow_read)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(*followers), flight.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == ["course"] * 3
+    assert stats["executions"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_failures_are_shared_and_released():
+    async def run():
+        flight = SingleFlight("test")
+        calls = []
+
+        async def failing_read():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *[flight.do(1, failing_read) for _ in range(5)],
+            return_exceptions=True,
+        )
+        return results, calls, flight.stats()
+
+    results, calls, stats = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(calls) == 1
+    assert stats["in_flight"] == 0